@@ -7,6 +7,7 @@ Tests all treasury management endpoints for functionality and data integrity.
 import requests
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any
 
@@ -17,6 +18,9 @@ class TreasuryAPITester:
         self.tests_run = 0
         self.tests_passed = 0
         self.test_results = []
+        # Shared session keeps connections alive across requests
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
 
     def log_test(self, name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test result"""
@@ -42,13 +46,12 @@ class TreasuryAPITester:
     def make_request(self, method: str, endpoint: str, data: Dict = None) -> tuple:
         """Make HTTP request and return (success, response_data, status_code)"""
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self.session.get(url, timeout=30)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=30)
+                response = self.session.post(url, json=data, timeout=30)
             else:
                 return False, f"Unsupported method: {method}", 0
                 
@@ -118,13 +121,16 @@ class TreasuryAPITester:
             self.log_test("Global Liquidity Position", False, f"Status: {status}", data)
             global_success = False
         
-        # Test regional liquidity
+        # Test regional liquidity (regions are independent, so request them concurrently)
         regions = ['APAC', 'EMEA', 'AMER']
         regional_success = True
         
-        for region in regions:
-            success, data, status = self.make_request('GET', f'treasury/liquidity/by-region/{region}')
-            
+        with ThreadPoolExecutor(len(regions)) as executor:
+            responses = list(executor.map(
+                lambda r: self.make_request('GET', f'treasury/liquidity/by-region/{r}'), regions
+            ))
+        
+        for region, (success, data, status) in zip(regions, responses):
             if success and 'total_usd' in data:
                 total_usd = data['total_usd']
                 account_count = data.get('account_count', 0)
@@ -154,13 +160,16 @@ class TreasuryAPITester:
             self.log_test("Cash Pool Status", False, f"Status: {status}", data)
             status_success = False
         
-        # Test pool calculations for each region
+        # Test pool calculations for each region (independent, so request them concurrently)
         regions = ['APAC', 'EMEA', 'AMER']
         calc_success = True
         
-        for region in regions:
-            success, data, status = self.make_request('POST', f'treasury/cash-pool/calculate/{region}')
-            
+        with ThreadPoolExecutor(len(regions)) as executor:
+            responses = list(executor.map(
+                lambda r: self.make_request('POST', f'treasury/cash-pool/calculate/{r}'), regions
+            ))
+        
+        for region, (success, data, status) in zip(regions, responses):
             if success and 'pool_name' in data:
                 pool_name = data['pool_name']
                 total_pooled = data.get('total_pooled_usd', 0)
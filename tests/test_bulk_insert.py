@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'treasury_test')
+
+from pymongo.errors import BulkWriteError
+
+from backend.server import bulk_insert
+
+
+class FailingCollection:
+    """Collection stub whose bulk writes reject the op at a fixed position in every batch"""
+
+    name = "stub"
+
+    def __init__(self, failing_index: int):
+        self.failing_index = failing_index
+        self.batches = []
+
+    async def bulk_write(self, ops, ordered=True):
+        self.batches.append(len(ops))
+        if len(ops) <= self.failing_index:
+            return type("Result", (), {"inserted_count": len(ops)})()
+        raise BulkWriteError({
+            "writeErrors": [{"index": self.failing_index, "code": 11000, "errmsg": "duplicate key"}],
+            "nInserted": len(ops) - 1,
+        })
+
+
+def test_bulk_insert_maps_error_indexes_to_input_positions():
+    collection = FailingCollection(failing_index=1)
+    documents = [{"n": i} for i in range(7)]
+
+    inserted, errors = asyncio.run(bulk_insert(collection, documents, batch_size=3))
+
+    assert sorted(collection.batches) == [1, 3, 3]
+    assert inserted == 5
+    assert sorted(err["index"] for err in errors) == [1, 4]
+    assert all(err == {"index": err["index"], "code": 11000, "message": "duplicate key"} for err in errors)
+
+
+def test_bulk_insert_without_errors():
+    collection = FailingCollection(failing_index=10)
+    documents = [{"n": i} for i in range(5)]
+
+    inserted, errors = asyncio.run(bulk_insert(collection, documents, batch_size=2))
+
+    assert inserted == 5
+    assert errors == []